@@ -1,6 +1,10 @@
 """__init__.py :: Exposes chrome_cookies function."""
 
-from pycookiecheat.chrome import chrome_cookies
+from pycookiecheat.chrome import (
+    ChromeCookieJar,
+    chrome_cookies,
+    chrome_cookies_async,
+)
 from pycookiecheat.common import BrowserType, get_cookies
 from pycookiecheat.firefox import firefox_cookies
 
@@ -10,7 +14,9 @@ __version__ = "v0.8.0"
 
 __all__ = [
     "BrowserType",
+    "ChromeCookieJar",
     "chrome_cookies",
+    "chrome_cookies_async",
     "firefox_cookies",
     "get_cookies",
 ]
@@ -3,9 +3,42 @@
 import argparse
 import json
 import logging
-from importlib.metadata import version
+import typing as t
 
-from .common import BrowserType, get_cookies
+from .chrome import ChromeCookieJar
+from .common import BrowserType, Cookie, write_cookie_file
+from .firefox import firefox_cookies
+
+
+class _VersionAction(argparse.Action):
+    """Print the installed version and exit, like argparse's "version" action.
+
+    Looking the version up in the package metadata takes longer than the rest
+    of building the parser, so it's only done when the flag is actually given.
+    """
+
+    def __init__(
+        self, option_strings: list[str], dest: str, help: str
+    ) -> None:
+        super().__init__(
+            option_strings=option_strings,
+            dest=argparse.SUPPRESS,
+            default=argparse.SUPPRESS,
+            nargs=0,
+            help=help,
+        )
+
+    def __call__(
+        self,
+        parser: argparse.ArgumentParser,
+        namespace: argparse.Namespace,
+        values: t.Any,
+        option_string: t.Optional[str] = None,
+    ) -> None:
+        from importlib.metadata import version
+
+        print(version(parser.prog))
+        parser.exit()
 
 
 def _cli() -> argparse.ArgumentParser:
@@ -14,6 +47,12 @@ def _cli() -> argparse.ArgumentParser:
         description="Copy cookies from Chrome or Firefox and output as json",
     )
     parser.add_argument("url")
+    parser.add_argument(
+        "more_urls",
+        nargs="*",
+        metavar="url",
+        help="Additional URLs, output as a JSON object keyed by URL",
+    )
     parser.add_argument(
         "-b", "--browser", type=BrowserType, default=BrowserType.CHROME
     )
@@ -40,8 +79,8 @@ def _cli() -> argparse.ArgumentParser:
     parser.add_argument(
         "-V",
         "--version",
-        action="version",
-        version=version(parser.prog),
+        action=_VersionAction,
+        help="show program's version number and exit",
     )
     return parser
 
@@ -55,15 +94,35 @@ def main() -> None:
 
     # todo: make this a match statement once MSPV is 3.10
     browser = BrowserType(args.browser)
+    urls = [args.url, *args.more_urls]
 
-    cookies = get_cookies(
-        url=args.url,
-        browser=browser,
-        curl_cookie_file=args.output_file,
-        cookie_file=args.cookie_file,
-    )
-    if not args.output_file:
-        print(json.dumps(cookies, indent=4))
+    results: list[t.Union[dict, list[Cookie]]]
+    if browser is BrowserType.FIREFOX:
+        results = [
+            firefox_cookies(url, as_cookies=True, cookie_file=args.cookie_file)
+            for url in urls
+        ]
+    else:
+        # Share one jar so the cookie DB is only opened (and the key only
+        # derived) once, however many URLs are given
+        with ChromeCookieJar(browser, cookie_file=args.cookie_file) as jar:
+            results = [jar.get(url, as_cookies=True) for url in urls]
+    cookies = t.cast(list[list[Cookie]], results)
+
+    if args.output_file:
+        write_cookie_file(
+            args.output_file,
+            [cookie for url_cookies in cookies for cookie in url_cookies],
+        )
+        return
+
+    values = [
+        {c.name: c.value for c in url_cookies} for url_cookies in cookies
+    ]
+    if len(urls) == 1:
+        print(json.dumps(values[0], indent=4))
+    else:
+        print(json.dumps(dict(zip(urls, values)), indent=4))
 
 
 if __name__ == "__main__":
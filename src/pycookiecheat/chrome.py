@@ -11,19 +11,14 @@ domain, just send it the domain you'd like to use instead.
 
 from __future__ import annotations
 
+import functools
+import hashlib
 import logging
 import sqlite3
 import sys
 import typing as t
 from pathlib import Path
 
-import keyring
-from cryptography.hazmat.primitives.ciphers import Cipher
-from cryptography.hazmat.primitives.ciphers.algorithms import AES
-from cryptography.hazmat.primitives.ciphers.modes import CBC
-from cryptography.hazmat.primitives.hashes import SHA1
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-
 from pycookiecheat.common import (
     BrowserType,
     Cookie,
@@ -32,10 +27,48 @@ from pycookiecheat.common import (
     write_cookie_file,
 )
 
+# `keyring` (which loads its backends through entry points) and `cryptography`
+# (which loads OpenSSL) are slow to import, so they're only imported once they
+# are needed; the CLI and Firefox users may never need them.
+if t.TYPE_CHECKING:
+    from cryptography.hazmat.primitives.ciphers import Cipher
+    from cryptography.hazmat.primitives.ciphers.modes import CBC
+
 logger = logging.getLogger(__name__)
 
+CHROME_COOKIE_SELECT_SQL = """
+    SELECT
+        host_key,
+        path,
+        {secure_column_name},
+        expires_utc,
+        name,
+        value,
+        encrypted_value
+    FROM cookies
+    WHERE host_key IN ({placeholders})
+    ORDER BY length(host_key);
+"""
+"""
+The query template for selecting the cookies for all host keys of a domain.
+
+Matching on equality (rather than `LIKE`) lets SQLite seek directly on the
+`host_key` index. `generate_host_keys` returns keys from least to most
+specific, each one longer than the last, so sorting on the key length keeps the
+more specific cookie last (and therefore the winner) when names collide.
+"""
+
+CURSOR_ARRAYSIZE = 512
+"""Number of rows to fetch from the cookie DB per `fetchmany` call."""
+
+_V1X_PREFIXES = (b"v10", b"v11")
+"""Prefixes of the encrypted values this module knows how to decrypt."""
+
+_AES_BLOCK_SIZE = 16
+"""Size of an AES block, in bytes."""
 
-def clean(decrypted: bytes) -> str:
+
+def clean(decrypted: t.Union[bytes, memoryview]) -> str:
     r"""Strip padding from decrypted value.
 
     Remove number indicated by padding
@@ -45,23 +78,27 @@ def clean(decrypted: bytes) -> str:
         decrypted: decrypted value
     Returns:
         decrypted, stripped of padding
+    Raises:
+        ValueError: if the padding length is out of range, or the result is
+                    not valid UTF8 (as a `UnicodeDecodeError`)
     """
-    last = decrypted[-1]
-    if isinstance(last, int):
-        return decrypted[:-last].decode("utf8")
-
+    padding = decrypted[-1]
+    if not 1 <= padding <= _AES_BLOCK_SIZE:
+        logger.error(
+            "The decrypted cookie has invalid padding. This is most often due "
+            "to attempting decryption with an incorrect key."
+        )
+        raise ValueError(f"Invalid padding length: {padding}")
     try:
-        cleaned = decrypted[: -ord(last)].decode("utf8")
+        return str(decrypted[:-padding], "utf8")
     except UnicodeDecodeError:
-        logging.error(
+        logger.error(
             "UTF8 decoding of the decrypted cookie failed. This is most often "
             "due to attempting decryption with an incorrect key. Consider "
             "searching the pycookiecheat issues for `UnicodeDecodeError`."
         )
         raise
 
-    return cleaned
-
 
 def chrome_decrypt(
     encrypted_value: bytes,
@@ -78,14 +115,40 @@ def chrome_decrypt(
     Returns:
         Decrypted value of encrypted_value
     """
-    # Encrypted cookies should be prefixed with 'v10' or 'v11' according to the
-    # Chromium code. Strip it off.
-    encrypted_value = encrypted_value[3:]
+    return _decrypt(
+        encrypted_value,
+        cipher=_make_cipher(key, init_vector),
+        cookie_database_version=cookie_database_version,
+    )
+
 
-    cipher = Cipher(
+def _make_cipher(key: bytes, init_vector: bytes) -> Cipher[CBC]:
+    """Configure an AES-CBC `Cipher` for decrypting cookies."""
+    from cryptography.hazmat.primitives.ciphers import Cipher
+    from cryptography.hazmat.primitives.ciphers.algorithms import AES
+    from cryptography.hazmat.primitives.ciphers.modes import CBC
+
+    return Cipher(
         algorithm=AES(key),
         mode=CBC(init_vector),
     )
+
+
+def _decrypt(
+    encrypted_value: bytes,
+    cipher: Cipher,
+    cookie_database_version: int,
+) -> str:
+    """Decrypt a single cookie using an already-configured `Cipher`.
+
+    Cookies are normally decrypted in a batch by `_decrypt_all`; this is used
+    by `chrome_decrypt`, and by `_decrypt_all` as its fallback for malformed
+    values that can't be batched.
+    """
+    # Encrypted cookies should be prefixed with 'v10' or 'v11' according to the
+    # Chromium code. Strip it off.
+    encrypted_value = encrypted_value[3:]
+
     decryptor = cipher.decryptor()
     decrypted = decryptor.update(encrypted_value) + decryptor.finalize()
 
@@ -98,6 +161,106 @@ def chrome_decrypt(
     return clean(decrypted)
 
 
+def _decrypt_all(
+    encrypted_values: list[bytes],
+    cipher: Cipher[CBC],
+    cookie_database_version: int,
+) -> list[str]:
+    """Decrypt a batch of cookies that share the same key and IV.
+
+    All of the ciphertexts are run through a single decryptor in one `update`
+    call, rather than setting up a decryptor per cookie. Laid end to end, CBC
+    decrypts the first block of each cookie against the last ciphertext block
+    of the cookie before it instead of the IV, so that block is corrected
+    afterwards by XORing it with both.
+
+    Args:
+        encrypted_values: Encrypted cookies, each with its 'v1[01]' prefix
+        cipher: `Cipher` configured with the cookie file's key and IV
+        cookie_database_version: Version from the cookie file's meta table
+    Returns:
+        Decrypted values, in the same order as encrypted_values
+    """
+    block_size = _AES_BLOCK_SIZE
+    ciphertexts = [encrypted_value[3:] for encrypted_value in encrypted_values]
+    if not all(ciphertexts) or any(len(c) % block_size for c in ciphertexts):
+        # Malformed values can't be laid end to end; decrypt them one at a
+        # time so the error points at the offending cookie.
+        return [
+            _decrypt(
+                encrypted_value,
+                cipher=cipher,
+                cookie_database_version=cookie_database_version,
+            )
+            for encrypted_value in encrypted_values
+        ]
+
+    decryptor = cipher.decryptor()
+    decrypted = memoryview(
+        bytearray(decryptor.update(b"".join(ciphertexts)))
+        + decryptor.finalize()
+    )
+
+    # Work on views into the one decrypted buffer, fixing up each cookie's
+    # first block in place, so no per-cookie copies are made before decoding.
+    # The hash of the domain in version 24+ is skipped, see `_decrypt`.
+    skip = 32 if cookie_database_version >= 24 else 0
+    init_vector = int.from_bytes(cipher.mode.initialization_vector, "big")
+    values = []
+    offset = 0
+    previous_block = b""
+    for ciphertext in ciphertexts:
+        end = offset + len(ciphertext)
+        if offset:
+            first_block = decrypted[offset : offset + block_size]
+            fixed = int.from_bytes(first_block, "big")
+            fixed ^= int.from_bytes(previous_block, "big") ^ init_vector
+            first_block[:] = fixed.to_bytes(block_size, "big")
+        values.append(clean(decrypted[offset + skip : end]))
+        offset = end
+        previous_block = ciphertext[-block_size:]
+    return values
+
+
+@functools.lru_cache(maxsize=8)
+def _derive_key(
+    key_material: bytes, salt: bytes, iterations: int, length: int
+) -> bytes:
+    """Derive the cookie encryption key from the browser's key material.
+
+    The inputs are constant for a given browser and OS, so the result is
+    cached to avoid re-running PBKDF2 (1003 iterations on MacOS) every time
+    `chrome_cookies` is called.
+    """
+    return hashlib.pbkdf2_hmac(
+        "sha1", key_material, salt, iterations, dklen=length
+    )
+
+
+# Key material found in the MacOS Keychain, keyed on the service and username.
+# Failed lookups aren't cached, so that they are retried once e.g. the user
+# has allowed access.
+_macos_key_materials: dict[tuple[str, str], str] = {}
+
+
+def _get_macos_key_material(
+    service_name: str, username: str
+) -> t.Optional[str]:
+    """Look up the browser's key material in the MacOS Keychain.
+
+    Each lookup goes through the Security framework and may prompt the user,
+    so key material that is found is cached for the lifetime of the process.
+    """
+    cache_key = (service_name, username)
+    if (key_material := _macos_key_materials.get(cache_key)) is None:
+        import keyring
+
+        key_material = keyring.get_password(service_name, username)
+        if key_material is not None:
+            _macos_key_materials[cache_key] = key_material
+    return key_material
+
+
 def get_macos_config(browser: BrowserType) -> dict:
     """Get settings for getting Chrome/Chromium cookies on MacOS.
 
@@ -140,7 +303,9 @@ def get_macos_config(browser: BrowserType) -> dict:
     if browser is BrowserType.SLACK:
         keyring_username = "Slack App Store Key"
 
-    key_material = keyring.get_password(keyring_service_name, keyring_username)
+    key_material = _get_macos_key_material(
+        keyring_service_name, keyring_username
+    )
     if key_material is None:
         errmsg = (
             "Could not find a password for the pair "
@@ -157,36 +322,14 @@ def get_macos_config(browser: BrowserType) -> dict:
     return config
 
 
-def get_linux_config(browser: BrowserType) -> dict:
-    """Get the settings for Chrome/Chromium cookies on Linux.
+@functools.lru_cache(maxsize=None)
+def _import_secret() -> t.Any:
+    """Import libsecret's `Secret` through PyGObject, if it is available.
 
-    Args:
-        browser: Enum variant representing browser of interest
-    Returns:
-        Config dictionary for Chrome/Chromium cookie decryption
+    Imported lazily (so MacOS and Firefox users never pay for GObject) but only
+    once, so `gi.require_version` and the GObject introspection lookups aren't
+    repeated for every browser. Returns `None` if it can't be imported.
     """
-    cookie_file = (
-        Path("~/.config")
-        / {
-            BrowserType.CHROME: "google-chrome/Default/Cookies",
-            BrowserType.CHROMIUM: "chromium/Default/Cookies",
-            BrowserType.BRAVE: "BraveSoftware/Brave-Browser/Default/Cookies",
-            BrowserType.SLACK: "Slack/Cookies",
-        }[browser]
-    )
-
-    # Set the default linux password
-    config = {
-        "key_material": "peanuts",
-        "iterations": 1,
-        "cookie_file": cookie_file,
-    }
-
-    browser_name = browser.title()
-
-    # Try to get pass from Gnome / libsecret if it seems available
-    # https://github.com/n8henrie/pycookiecheat/issues/12
-    key_material = None
     try:
         import gi
 
@@ -194,39 +337,67 @@ def get_linux_config(browser: BrowserType) -> dict:
         from gi.repository import Secret
     except ImportError:
         logger.info("Was not able to import `Secret` from `gi.repository`")
-    else:
-        flags = Secret.ServiceFlags.LOAD_COLLECTIONS
-        service = Secret.Service.get_sync(flags)
+        return None
+    return Secret
+
 
-        gnome_keyring = service.get_collections()
-        unlocked_keyrings = service.unlock_sync(gnome_keyring).unlocked
+# Key material found in the Linux keyrings, keyed on the browser. Failed
+# lookups aren't cached, so that they are retried once e.g. the keyring has
+# been unlocked.
+_linux_key_materials: dict[BrowserType, str] = {}
 
+
+def _get_linux_key_material(browser: BrowserType) -> t.Optional[str]:
+    """Look up the browser's key material in the Linux keyrings.
+
+    Searching the keyrings means IPC to the secret service (and possibly
+    unlocking collections), so key material that is found is cached for the
+    lifetime of the process. Returns `None` if no key material was found.
+    """
+    if (key_material := _linux_key_materials.get(browser)) is None:
+        key_material = _search_linux_keyrings(browser)
+        if key_material is not None:
+            _linux_key_materials[browser] = key_material
+    return key_material
+
+
+def _search_linux_keyrings(browser: BrowserType) -> t.Optional[str]:
+    """Search libsecret and then `keyring` for the browser's key material."""
+    browser_name = browser.title()
+
+    # Try to get pass from Gnome / libsecret if it seems available
+    # https://github.com/n8henrie/pycookiecheat/issues/12
+    key_material = None
+    Secret = _import_secret()
+    if Secret is not None:
         # While Slack on Linux has its own Cookies file, the password
         # is stored in a keyring named the same as Chromium's, but with
         # an "application" attribute of "Slack".
         keyring_name = f"{browser_name} Safe Storage"
 
-        for unlocked_keyring in unlocked_keyrings:
-            for item in unlocked_keyring.get_items():
+        # Let the secret service filter on the "application" attribute, so
+        # only the matching items are unlocked, and only load the secret of
+        # the one with the right label. The attribute is matched exactly:
+        # Chromium stores e.g. "chrome", but Slack stores "Slack".
+        search_flags = Secret.SearchFlags.ALL | Secret.SearchFlags.UNLOCK
+        service = Secret.Service.get_sync(Secret.ServiceFlags.NONE)
+        for application in (browser.value, browser_name):
+            items = service.search_sync(
+                None, {"application": application}, search_flags, None
+            )
+            for item in items:
                 if item.get_label() == keyring_name:
-                    item_app = item.get_attributes().get(
-                        "application", browser
-                    )
-                    if item_app.lower() != browser.lower():
-                        continue
                     item.load_secret_sync()
                     key_material = item.get_secret().get_text()
                     break
-            else:
-                # Inner loop didn't `break`, keep looking
-                continue
-
-            # Inner loop did `break`, so `break` outer loop
-            break
+            if key_material is not None:
+                break
 
     # Try to get pass from keyring, which should support KDE / KWallet
     # if dbus-python is installed.
     if key_material is None:
+        import keyring
+
         try:
             key_material = keyring.get_password(
                 f"{browser_name} Keys",
@@ -235,6 +406,36 @@ def get_linux_config(browser: BrowserType) -> dict:
         except RuntimeError:
             logger.info("Was not able to access secrets from keyring")
 
+    return key_material
+
+
+def get_linux_config(browser: BrowserType) -> dict:
+    """Get the settings for Chrome/Chromium cookies on Linux.
+
+    Args:
+        browser: Enum variant representing browser of interest
+    Returns:
+        Config dictionary for Chrome/Chromium cookie decryption
+    """
+    cookie_file = (
+        Path("~/.config")
+        / {
+            BrowserType.CHROME: "google-chrome/Default/Cookies",
+            BrowserType.CHROMIUM: "chromium/Default/Cookies",
+            BrowserType.BRAVE: "BraveSoftware/Brave-Browser/Default/Cookies",
+            BrowserType.SLACK: "Slack/Cookies",
+        }[browser]
+    )
+
+    # Set the default linux password
+    config = {
+        "key_material": "peanuts",
+        "iterations": 1,
+        "cookie_file": cookie_file,
+    }
+
+    key_material = _get_linux_key_material(browser)
+
     # Overwrite the default only if a different password has been found
     if key_material is not None:
         config["key_material"] = key_material
@@ -242,6 +443,259 @@ def get_linux_config(browser: BrowserType) -> dict:
     return config
 
 
+# Keyed on the cookie file's path and modification time, so a schema change
+# (e.g. from a browser update) is picked up.
+_secure_column_names: dict[tuple[str, int], str] = {}
+
+
+def _get_secure_column_name(
+    conn: sqlite3.Connection, cookie_path: Path
+) -> str:
+    """Get the column to select as `is_secure` from the `cookies` table.
+
+    Older cookie databases name the column `secure` rather than `is_secure`.
+    The answer can't change until the file does, so it is cached per file to
+    save a `PRAGMA table_info` round trip on every call.
+
+    Args:
+        conn: Connection to the cookie database
+        cookie_path: Absolute path that `conn` was opened on
+    """
+    cache_key = (str(cookie_path), cookie_path.stat().st_mtime_ns)
+    if (secure_column_name := _secure_column_names.get(cache_key)) is None:
+        secure_column_name = "is_secure"
+        for (
+            sl_no,
+            column_name,
+            data_type,
+            is_null,
+            default_val,
+            pk,
+        ) in conn.execute("PRAGMA table_info(cookies)"):
+            # `text_factory` is `bytes`
+            if column_name == b"secure":
+                secure_column_name = "secure AS is_secure"
+                break
+        _secure_column_names[cache_key] = secure_column_name
+    return secure_column_name
+
+
+class ChromeCookieJar:
+    """Retrieve cookies for many URLs from a single Chrome/Chromium profile.
+
+    Resolving the browser config (including any keyring lookup) and opening
+    the cookie database happen once, when the jar is created, and the
+    encryption key is derived once, when first needed; each `get` then only
+    has to query and decrypt the cookies for its URL. Use it as a context
+    manager, or call `close` when finished.
+
+    >>> with ChromeCookieJar(BrowserType.CHROME) as jar:  # doctest: +SKIP
+    ...     for url in ["https://n8henrie.com", "https://github.com"]:
+    ...         cookies = jar.get(url)
+
+    Args:
+        browser: Enum variant representing browser of interest
+        cookie_file: Path to alternate file to search for cookies
+        password: Optional system password
+    """
+
+    def __init__(
+        self,
+        browser: BrowserType = BrowserType.CHROME,
+        *,
+        cookie_file: t.Optional[t.Union[str, Path]] = None,
+        password: t.Optional[t.Union[bytes, str]] = None,
+    ) -> None:
+        # Force a ValueError early if a string of an unrecognized browser is
+        # passed
+        browser = BrowserType(browser)
+
+        # If running Chrome on MacOS
+        if sys.platform == "darwin":
+            config = get_macos_config(browser)
+        elif sys.platform.startswith("linux"):
+            config = get_linux_config(browser)
+        else:
+            raise OSError("This script only works on MacOS or Linux.")
+
+        config.update({
+            "init_vector": b" " * 16,
+            "length": 16,
+            "salt": b"saltysalt",
+        })
+
+        if cookie_file is None:
+            cookie_file = config["cookie_file"]
+        cookie_file = Path(cookie_file)
+
+        if isinstance(password, bytes):
+            config["key_material"] = password
+        elif isinstance(password, str):
+            config["key_material"] = password.encode("utf8")
+        elif isinstance(config["key_material"], str):
+            config["key_material"] = config["key_material"].encode("utf8")
+
+        # The browser may be writing to the file while we read it, so it is
+        # opened read-only but not `immutable`, which would skip SQLite's
+        # locking and journal (or WAL) checks. The connection is only ever
+        # read from, so leave it in autocommit mode rather than have `sqlite3`
+        # manage transactions for it. `Path.as_uri` percent-encodes the path,
+        # so characters like `?` or `#` in it aren't mistaken for the start of
+        # the URI's query string or fragment.
+        cookie_path = cookie_file.expanduser().absolute()
+        uri = f"{cookie_path.as_uri()}?mode=ro"
+        try:
+            conn = sqlite3.connect(
+                uri,
+                uri=True,
+                isolation_level=None,
+            )
+        except sqlite3.OperationalError as e:
+            logger.error("Unable to connect to cookie_file at %s", cookie_file)
+            raise e
+
+        # Don't leak the connection if it turns out not to be a usable cookie
+        # database (e.g. `DatabaseError: file is not a database`)
+        try:
+            # Belt and braces on top of `mode=ro`: refuse any statement that
+            # would write, so SQLite never has to consider opening a write
+            # transaction.
+            conn.execute("PRAGMA query_only = ON")
+
+            conn.text_factory = bytes
+
+            sql = "select value from meta where key = 'version';"
+            cookie_database_version = 0
+            try:
+                row = conn.execute(sql).fetchone()
+                if row:
+                    cookie_database_version = int(row[0])
+                else:
+                    logger.info(
+                        "cookie database version not found in meta table"
+                    )
+            except sqlite3.OperationalError:
+                logger.info("cookie database is missing meta table")
+
+            secure_column_name = _get_secure_column_name(conn, cookie_path)
+        except BaseException:
+            conn.close()
+            raise
+
+        self.browser = browser
+        self.cookie_file = cookie_file
+        self._conn = conn
+        self._cookie_database_version = cookie_database_version
+        self._secure_column_name = secure_column_name
+        self._config = config
+
+    @functools.cached_property
+    def _cipher(self) -> Cipher[CBC]:
+        """Set up the cipher the first time a cookie needs decrypting.
+
+        Deriving the key runs PBKDF2 (1003 iterations on MacOS), which would be
+        wasted if none of the requested URLs have any encrypted cookies.
+        """
+        enc_key = _derive_key(
+            self._config["key_material"],
+            salt=self._config["salt"],
+            iterations=self._config["iterations"],
+            length=self._config["length"],
+        )
+        return _make_cipher(enc_key, self._config["init_vector"])
+
+    def __enter__(self) -> ChromeCookieJar:
+        """Return the jar itself for use as a context manager."""
+        return self
+
+    def __exit__(self, *_: t.Any) -> None:
+        """Close the jar on leaving the context manager."""
+        self.close()
+
+    def close(self) -> None:
+        """Close the connection to the cookie database."""
+        self._conn.close()
+
+    def get(
+        self,
+        url: str,
+        *,
+        as_cookies: bool = False,
+        curl_cookie_file: t.Optional[t.Union[str, Path]] = None,
+    ) -> t.Union[dict, list[Cookie]]:
+        """Retrieve the cookies for `url`.
+
+        Args:
+            url: Domain from which to retrieve cookies, starting with http(s)
+            as_cookies: Return `list[Cookie]` instead of `dict`
+            curl_cookie_file: Path to save the cookie file to be used with
+                              cURL
+        Returns:
+            Dictionary of cookie values for URL
+        """
+        domain = get_domain(url)
+
+        # Chrome stores `host_key` lowercased
+        host_keys = generate_host_keys(domain.lower())
+        sql = CHROME_COOKIE_SELECT_SQL.format(
+            secure_column_name=self._secure_column_name,
+            placeholders=", ".join("?" * len(host_keys)),
+        )
+
+        cookies: list[Cookie] = []
+        # Indices into `cookies` of the ones that need decrypting, alongside
+        # their encrypted values
+        encrypted: list[int] = []
+        encrypted_values: list[bytes] = []
+        cursor = self._conn.cursor()
+        cursor.arraysize = CURSOR_ARRAYSIZE
+        cursor.execute(sql, host_keys)
+        while db_rows := cursor.fetchmany():
+            # Unpack positionally in `CHROME_COOKIE_SELECT_SQL`'s column
+            # order rather than building a dict for every row
+            for (
+                host_key,
+                path,
+                is_secure,
+                expires_utc,
+                name,
+                value,
+                encrypted_value,
+            ) in db_rows:
+                # if there is a not encrypted value or if the encrypted value
+                # doesn't start with the 'v1[01]' prefix, return v
+                if not value and encrypted_value.startswith(_V1X_PREFIXES):
+                    encrypted.append(len(cookies))
+                    encrypted_values.append(encrypted_value)
+                cookies.append(
+                    Cookie(
+                        name=name.decode("utf8"),
+                        value=value.decode("utf8"),
+                        host_key=host_key.decode("utf8"),
+                        path=path.decode("utf8"),
+                        expires_utc=expires_utc,
+                        is_secure=is_secure,
+                    )
+                )
+
+        if encrypted_values:
+            decrypted = _decrypt_all(
+                encrypted_values,
+                cipher=self._cipher,
+                cookie_database_version=self._cookie_database_version,
+            )
+            for idx, value in zip(encrypted, decrypted):
+                cookies[idx].value = value
+
+        if curl_cookie_file:
+            write_cookie_file(curl_cookie_file, cookies)
+
+        if as_cookies:
+            return cookies
+
+        return {c.name: c.value for c in cookies}
+
+
 def chrome_cookies(
     url: str,
     *,
@@ -259,6 +713,9 @@ def chrome_cookies(
         - other parameters common to both above functions, alphabetical
         - parameters with unique to either above function, alphabetical
 
+    When retrieving cookies for several URLs, prefer a `ChromeCookieJar`,
+    which only does the setup work once.
+
     Args:
         url: Domain from which to retrieve cookies, starting with http(s)
         browser: Enum variant representing browser of interest
@@ -269,113 +726,41 @@ def chrome_cookies(
     Returns:
         Dictionary of cookie values for URL
     """
-    domain = get_domain(url)
-
-    # Force a ValueError early if a string of an unrecognized browser is passed
-    browser = BrowserType(browser)
-
-    # If running Chrome on MacOS
-    if sys.platform == "darwin":
-        config = get_macos_config(browser)
-    elif sys.platform.startswith("linux"):
-        config = get_linux_config(browser)
-    else:
-        raise OSError("This script only works on MacOS or Linux.")
-
-    config.update({
-        "init_vector": b" " * 16,
-        "length": 16,
-        "salt": b"saltysalt",
-    })
-
-    if cookie_file is None:
-        cookie_file = config["cookie_file"]
-    cookie_file = Path(cookie_file)
-
-    if isinstance(password, bytes):
-        config["key_material"] = password
-    elif isinstance(password, str):
-        config["key_material"] = password.encode("utf8")
-    elif isinstance(config["key_material"], str):
-        config["key_material"] = config["key_material"].encode("utf8")
-
-    kdf = PBKDF2HMAC(
-        algorithm=SHA1(),
-        iterations=config["iterations"],
-        length=config["length"],
-        salt=config["salt"],
-    )
-    enc_key = kdf.derive(config["key_material"])
-
-    try:
-        conn = sqlite3.connect(
-            f"file:{cookie_file.expanduser()}?mode=ro", uri=True
+    with ChromeCookieJar(
+        browser, cookie_file=cookie_file, password=password
+    ) as jar:
+        return jar.get(
+            url, as_cookies=as_cookies, curl_cookie_file=curl_cookie_file
         )
-    except sqlite3.OperationalError as e:
-        logger.error("Unable to connect to cookie_file at %s", cookie_file)
-        raise e
 
-    conn.row_factory = sqlite3.Row
-    conn.text_factory = bytes
 
-    sql = "select value from meta where key = 'version';"
-    cookie_database_version = 0
-    try:
-        row = conn.execute(sql).fetchone()
-        if row:
-            cookie_database_version = int(row[0])
-        else:
-            logger.info("cookie database version not found in meta table")
-    except sqlite3.OperationalError:
-        logger.info("cookie database is missing meta table")
-
-    # Check whether the column name is `secure` or `is_secure`
-    secure_column_name = "is_secure"
-    for (
-        sl_no,
-        column_name,
-        data_type,
-        is_null,
-        default_val,
-        pk,
-    ) in conn.execute("PRAGMA table_info(cookies)"):
-        if column_name == "secure":
-            secure_column_name = "secure AS is_secure"
-            break
-
-    sql = (
-        f"select host_key, path, {secure_column_name}, "
-        "expires_utc, name, value, encrypted_value "
-        "from cookies where host_key like ?"
-    )
-
-    cookies: list[Cookie] = []
-    for host_key in generate_host_keys(domain):
-        for db_row in conn.execute(sql, (host_key,)):
-            # if there is a not encrypted value or if the encrypted value
-            # doesn't start with the 'v1[01]' prefix, return v
-            row = dict(db_row)
-            if not row["value"] and (
-                row["encrypted_value"][:3] in {b"v10", b"v11"}
-            ):
-                row["value"] = chrome_decrypt(
-                    row["encrypted_value"],
-                    key=enc_key,
-                    init_vector=config["init_vector"],
-                    cookie_database_version=cookie_database_version,
-                )
-            del row["encrypted_value"]
-            for key, value in row.items():
-                if isinstance(value, bytes):
-                    row[key] = value.decode("utf8")
-            cookies.append(Cookie(**row))
-
-    conn.rollback()
-
-    if curl_cookie_file:
-        write_cookie_file(curl_cookie_file, cookies)
+async def chrome_cookies_async(
+    url: str,
+    *,
+    browser: BrowserType = BrowserType.CHROME,
+    as_cookies: bool = False,
+    cookie_file: t.Optional[t.Union[str, Path]] = None,
+    curl_cookie_file: t.Optional[t.Union[str, Path]] = None,
+    password: t.Optional[t.Union[bytes, str]] = None,
+) -> t.Union[dict, list[Cookie]]:
+    """Retrieve cookies from Chrome/Chromium without blocking the event loop.
 
-    if as_cookies:
-        return cookies
+    Runs `chrome_cookies` in a worker thread, so the event loop isn't blocked
+    while it does. Takes the same arguments as `chrome_cookies`.
 
-    return {c.name: c.value for c in cookies}
+    Returns:
+        Dictionary of cookie values for URL
+    """
+    # `asyncio` alone would roughly double the time it takes to import this
+    # module, and only async callers (which have already imported it) pay
+    import asyncio
+
+    return await asyncio.to_thread(
+        chrome_cookies,
+        url,
+        browser=browser,
+        as_cookies=as_cookies,
+        cookie_file=cookie_file,
+        curl_cookie_file=curl_cookie_file,
+        password=password,
+    )
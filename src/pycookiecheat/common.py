@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
+import functools
 import logging
+import re
 import typing as t
-import urllib.parse
 from dataclasses import dataclass
 from enum import Enum, unique
 from pathlib import Path
@@ -14,6 +15,16 @@ import pycookiecheat
 
 logger = logging.getLogger(__name__)
 
+# An optional scheme, then the netloc: everything up to the path, query or
+# fragment
+_URL_NETLOC_RE = re.compile(r"(?:[A-Za-z][A-Za-z0-9+.-]*://)?([^/?#]*)")
+
+# Like `urllib.parse`, ignore whitespace around a URL (C0 control characters
+# and space) and tabs or newlines within it, e.g. from pasting the URL or
+# reading it from a file
+_URL_STRIP_CHARS = "".join(map(chr, range(0x21)))
+_URL_REMOVE_CHARS = str.maketrans("", "", "\t\r\n")
+
 
 @dataclass
 class Cookie:
@@ -21,8 +32,23 @@ class Cookie:
 
     Cookies returned to the user from the public API are dicts, not instances
     of this class.
+
+    There can be thousands of these, so they use `__slots__` rather than a
+    per-instance `__dict__`.
+
+    TODO: use `@dataclass(slots=True)` once pycookiecheat depends on python >=
+    3.10
     """
 
+    __slots__ = (
+        "name",
+        "value",
+        "host_key",
+        "path",
+        "expires_utc",
+        "is_secure",
+    )
+
     name: str
     value: str
     host_key: str
@@ -35,21 +61,18 @@ class Cookie:
 
         See details at http://www.cookiecentral.com/faq/#3.5
         """
-        return "\t".join([
-            self.host_key,
-            "TRUE",
-            self.path,
-            "TRUE" if self.is_secure else "FALSE",
-            str(self.expires_utc),
-            self.name,
-            self.value,
-        ])
+        secure = "TRUE" if self.is_secure else "FALSE"
+        return (
+            f"{self.host_key}\tTRUE\t{self.path}\t{secure}\t"
+            f"{self.expires_utc}\t{self.name}\t{self.value}"
+        )
 
 
-def generate_host_keys(hostname: str) -> t.Iterator[str]:
-    """Yield keys for `hostname`, from least to most specific.
+@functools.lru_cache(maxsize=1024)
+def generate_host_keys(hostname: str) -> tuple[str, ...]:
+    """Return keys for `hostname`, from least to most specific.
 
-    Given a hostname like foo.example.com, this yields the key sequence:
+    Given a hostname like foo.example.com, this returns the key sequence:
 
     example.com
     .example.com
@@ -57,16 +80,24 @@ def generate_host_keys(hostname: str) -> t.Iterator[str]:
     .foo.example.com
 
     Treat "localhost" explicitly by returning only itself.
+
+    The same hostnames tend to come up again and again when fetching cookies
+    for many URLs, so results are cached (hence a tuple rather than a
+    generator).
     """
     if hostname == "localhost":
-        yield hostname
-        return
+        return (hostname,)
 
+    # Build each suffix from the previous one rather than re-joining the
+    # labels every time
     labels = hostname.split(".")
+    domain = labels[-1]
+    host_keys = []
     for i in range(2, len(labels) + 1):
-        domain = ".".join(labels[-i:])
-        yield domain
-        yield "." + domain
+        domain = f"{labels[-i]}.{domain}"
+        host_keys.append(domain)
+        host_keys.append("." + domain)
+    return tuple(host_keys)
 
 
 def deprecation_warning(msg: str) -> None:
@@ -111,26 +142,33 @@ class BrowserType(str, Enum):
         Traceback (most recent call last):
         ValueError: 'edge' is not a valid BrowserType
         """
-        folded = value.casefold()
-        for member in cls:
-            if member.value == folded:
-                return member
-        raise ValueError(f"{value!r} is not a valid {cls.__qualname__}")
+        return _resolve_browser_type(value)
+
+
+@functools.lru_cache(maxsize=32)
+def _resolve_browser_type(value: str) -> BrowserType:
+    """Match `value` against the `BrowserType` values, ignoring case.
+
+    `BrowserType._missing_` runs every time a browser is given as a string
+    that isn't already lowercase, so the result is cached.
+    """
+    folded = value.casefold()
+    for member in BrowserType:
+        if member.value == folded:
+            return member
+    raise ValueError(f"{value!r} is not a valid {BrowserType.__qualname__}")
 
 
 def write_cookie_file(path: Path | str, cookies: list[Cookie]) -> None:
     """Write cookies to a file in Netscape Cookie File format."""
     path = Path(path)
-    # Some programs won't recognize this as a valid cookie file without the
-    # header
-    output = (
-        "\n".join(
-            ["# Netscape HTTP Cookie File"]
-            + [c.as_cookie_file_line() for c in cookies]
-        )
-        + "\n"
-    )
-    path.write_text(output)
+    # Stream the lines out through the file's buffer rather than building the
+    # whole file in memory first
+    with path.open("w") as f:
+        # Some programs won't recognize this as a valid cookie file without
+        # the header
+        f.write("# Netscape HTTP Cookie File\n")
+        f.writelines(f"{c.as_cookie_file_line()}\n" for c in cookies)
 
 
 def get_domain(url: str) -> str:
@@ -138,12 +176,11 @@ def get_domain(url: str) -> str:
 
     If the scheme is not specified, `https://` is assumed.
     """
-    parsed_url = urllib.parse.urlparse(url)
-    if not parsed_url.scheme:
-        parsed_url = urllib.parse.urlparse(f"https://{url}")
-
-    domain = parsed_url.netloc
-    return domain
+    url = url.strip(_URL_STRIP_CHARS).translate(_URL_REMOVE_CHARS)
+    # `match` can't return `None`: the scheme is optional and the netloc may
+    # be empty, so the pattern matches (at least) the empty string
+    match = t.cast("re.Match[str]", _URL_NETLOC_RE.match(url))
+    return match.group(1)
 
 
 def get_cookies(
@@ -179,7 +216,10 @@ def get_cookies(
     Returns:
         Dictionary of cookie values for URL
     """
-    if browser == BrowserType.FIREFOX:
+    # `browser` may still be a string; coerce it to the canonical member so it
+    # can be compared by identity
+    browser = BrowserType(browser)
+    if browser is BrowserType.FIREFOX:
         cookies = pycookiecheat.firefox_cookies(
             url,
             browser=browser,
@@ -14,8 +14,11 @@ Example:
 
 from __future__ import annotations
 
-import configparser
+import contextlib
+import functools
+import itertools
 import logging
+import re
 import shutil
 import sqlite3
 import sys
@@ -35,20 +38,41 @@ logger = logging.getLogger(__name__)
 
 FIREFOX_COOKIE_SELECT_SQL = """
     SELECT
-        `host` AS host_key,
         name,
         value,
+        `host` AS host_key,
         `path`,
-        isSecure AS is_secure,
-        expiry AS expires_utc
+        expiry AS expires_utc,
+        isSecure AS is_secure
     FROM moz_cookies
-    WHERE host = ?;
+    WHERE host IN ({placeholders})
+    ORDER BY length(host);
 """
 """
-The query for selecting the cookies for a host.
+The query template for selecting the cookies for all host keys of a domain.
 
 Rename some columns to match the Chrome cookie db row names.
-This makes the common.Cookie class simpler.
+This makes the common.Cookie class simpler. The columns are in the same order
+as `Cookie`'s fields, so rows can be passed to it positionally.
+
+`generate_host_keys` returns keys from least to most specific, each one longer
+than the last, so sorting on the key length keeps the more specific cookie last
+(and therefore the winner) when names collide.
+"""
+
+FIREFOX_COOKIE_VALUES_SELECT_SQL = """
+    SELECT
+        name,
+        value
+    FROM moz_cookies
+    WHERE host IN ({placeholders})
+    ORDER BY length(host);
+"""
+"""
+Like `FIREFOX_COOKIE_SELECT_SQL`, but only for the names and values.
+
+This is all that's needed for the default `dict` return value, whose rows can
+then be fed straight to `dict` without building a `Cookie` for each of them.
 """
 
 FIREFOX_OS_PROFILE_DIRS: dict[str, dict[str, str]] = {
@@ -64,6 +88,23 @@ FIREFOX_OS_PROFILE_DIRS: dict[str, dict[str, str]] = {
 }
 
 
+_PLATFORM_OS = {
+    "linux": "linux",
+    "darwin": "macos",
+    "win32": "windows",
+}
+"""Map `sys.platform` values to the keys of `FIREFOX_OS_PROFILE_DIRS`."""
+
+
+# One match per section header or `key=value` line of profiles.ini; comments
+# and blank lines don't match
+_INI_LINE_RE = re.compile(
+    r"^[ \t]*(?:\[(?P<section>[^\n]*)\]"
+    r"|(?P<key>[^\s=;#][^=\n]*?)[ \t]*=[ \t]*(?P<value>[^\n]*?))[ \t]*$",
+    re.MULTILINE,
+)
+
+
 class FirefoxProfileNotPopulatedError(Exception):
     """Raised when the Firefox profile has never been used."""
 
@@ -83,6 +124,35 @@ def _get_profiles_dir_for_os(
     return Path(os_config[browser]).expanduser()
 
 
+def _read_profiles_ini(path: Path) -> dict[str, dict[str, str]]:
+    """Read Firefox's profiles.ini into a dict of sections.
+
+    profiles.ini is a plain INI file (no interpolation, multi-line values or
+    defaults), so a single regex pass is all it takes rather than
+    `configparser`. Like `configparser`, keys are lowercased, and a missing
+    file reads as empty.
+
+    Args:
+        path: Path to profiles.ini
+    Returns:
+        Mapping of section names to that section's keys and values
+    """
+    sections: dict[str, dict[str, str]] = {}
+    try:
+        text = path.read_text(encoding="utf8")
+    except FileNotFoundError:
+        return sections
+
+    section: t.Optional[dict[str, str]] = None
+    for match in _INI_LINE_RE.finditer(text):
+        name, key, value = match.groups()
+        if name is not None:
+            section = sections.setdefault(name, {})
+        elif section is not None:
+            section[key.lower()] = value
+    return sections
+
+
 def _find_firefox_default_profile(firefox_dir: Path) -> str:
     """
     Return the name of the default Firefox profile.
@@ -102,33 +172,115 @@ def _find_firefox_default_profile(firefox_dir: Path) -> str:
     default profile in the `Default` key.
 
     https://support.mozilla.org/en-US/kb/understanding-depth-profile-installation
+
+    The result is cached until profiles.ini is modified.
     """
-    profiles_ini = configparser.ConfigParser()
-    profiles_ini.read(firefox_dir / "profiles.ini")
-    installs = [s for s in profiles_ini.sections() if s.startswith("Install")]
+    profiles_ini = firefox_dir / "profiles.ini"
+    try:
+        mtime_ns: t.Optional[int] = profiles_ini.stat().st_mtime_ns
+    except FileNotFoundError:
+        mtime_ns = None
+    return _find_default_profile_in(profiles_ini, mtime_ns)
+
+
+@functools.lru_cache(maxsize=8)
+def _find_default_profile_in(
+    profiles_ini_path: Path, mtime_ns: t.Optional[int]
+) -> str:
+    """Look up the default profile in `profiles_ini_path`.
+
+    `mtime_ns` is unused other than as part of the cache key, so an edited
+    profiles.ini is read again.
+    """
+    profiles_ini = _read_profiles_ini(profiles_ini_path)
+    installs = [s for s in profiles_ini if s.startswith("Install")]
     if installs:  # Firefox >= 67
         # Heuristic: Take the first install, that's probably the system install
-        return profiles_ini[installs[0]]["Default"]
+        return profiles_ini[installs[0]]["default"]
     else:  # Firefox < 67
-        profiles = [
-            s for s in profiles_ini.sections() if s.startswith("Profile")
-        ]
+        profiles = [s for s in profiles_ini if s.startswith("Profile")]
         for profile in profiles:
-            if profiles_ini[profile].get("Default") == "1":
-                return profiles_ini[profile]["Path"]
+            if profiles_ini[profile].get("default") == "1":
+                return profiles_ini[profile]["path"]
         if profiles:
-            return profiles_ini[profiles[0]]["Path"]
-        raise Exception("no profiles found at {}".format(firefox_dir))
+            return profiles_ini[profiles[0]]["path"]
+        raise Exception(
+            "no profiles found at {}".format(profiles_ini_path.parent)
+        )
 
 
 def _copy_if_exists(src: list[Path], dest: Path) -> None:
+    # The copies are thrown away after reading, so there's no point in
+    # `shutil.copy2` copying their metadata as well
     for file in src:
         try:
-            shutil.copy2(file, dest)
+            shutil.copyfile(file, dest / file.name)
         except FileNotFoundError as e:
             logger.exception(e)
 
 
+def _find_firefox_cookie_db(
+    profiles_dir: Path,
+    profile_name: t.Optional[str] = None,
+    cookie_file: t.Optional[t.Union[str, Path]] = None,
+) -> Path:
+    """
+    Return the path to the selected browser profile's cookie database.
+
+    Args:
+        profiles_dir: Browser+OS paths profiles_dir path
+        profile_name: Name (or glob pattern) of the Firefox profile to search
+                      for cookies -- if none given it will find the configured
+                      default profile
+        cookie_file: optional custom path to a specific cookie file
+    Returns:
+        Path to the profile's cookies.sqlite, or `cookie_file` if given
+    """
+    if cookie_file:
+        return Path(cookie_file)
+
+    if not profile_name:
+        profile_name = _find_firefox_default_profile(profiles_dir)
+    # Only scan the profiles directory if `profile_name` is a pattern
+    if any(char in profile_name for char in "*?["):
+        for profile_dir in profiles_dir.glob(profile_name):
+            if (profile_dir / "cookies.sqlite").exists():
+                return profile_dir / "cookies.sqlite"
+    else:
+        cookies_db = profiles_dir / profile_name / "cookies.sqlite"
+        if cookies_db.exists():
+            return cookies_db
+    raise FirefoxProfileNotPopulatedError(profiles_dir / profile_name)
+
+
+def _select_cookies(
+    con: sqlite3.Connection,
+    host_keys: tuple[str, ...],
+    as_cookies: bool,
+) -> t.Union[dict, list[Cookie]]:
+    """Select the cookies for `host_keys` from a Firefox cookie DB.
+
+    Args:
+        con: Connection to the cookie DB
+        host_keys: Host keys to select cookies for, as from
+                   `generate_host_keys`
+        as_cookies: Return `list[Cookie]` instead of a `dict` of only the
+                    names and values
+    Returns:
+        The cookies for `host_keys`
+    """
+    placeholders = ", ".join("?" * len(host_keys))
+    if not as_cookies:
+        sql = FIREFOX_COOKIE_VALUES_SELECT_SQL.format(
+            placeholders=placeholders
+        )
+        return dict(con.execute(sql, host_keys))
+
+    sql = FIREFOX_COOKIE_SELECT_SQL.format(placeholders=placeholders)
+    rows = con.execute(sql, host_keys)
+    return list(itertools.starmap(Cookie, rows))
+
+
 def _load_firefox_cookie_db(
     profiles_dir: Path,
     tmp_dir: Path,
@@ -146,7 +298,7 @@ def _load_firefox_cookie_db(
                       default profile
         cookie_file: optional custom path to a specific cookie file
     Returns:
-        Path to the "deWAL'ed" temporary copy of cookies.sqlite
+        Path to the temporary copy of cookies.sqlite
 
     Firefox stores its cookies in an SQLite3 database file. While Firefox is
     running it has an exclusive lock on this file and other processes can't
@@ -156,31 +308,20 @@ def _load_firefox_cookie_db(
     The SQLite database uses a feature called WAL ("write-ahead logging") that
     writes transactions for the database into a second file _prior_ to writing
     it to the actual DB. When copying the database this method also copies the
-    WAL file and then merges any outstanding writes, to make sure the cookies
-    DB has the most recent data.
+    WAL file, so that opening the copy picks up any outstanding writes and
+    the cookies DB has the most recent data.
     """
-
-    if cookie_file:
-        cookies_db = Path(cookie_file)
-        cookies_wal = Path(cookies_db).parent / "cookies.sqlite-wal"
-
-    else:
-        if not profile_name:
-            profile_name = _find_firefox_default_profile(profiles_dir)
-        for profile_dir in profiles_dir.glob(profile_name):
-            if (profile_dir / "cookies.sqlite").exists():
-                break
-        else:
-            raise FirefoxProfileNotPopulatedError(profiles_dir / profile_name)
-        cookies_db = profile_dir / "cookies.sqlite"
-        cookies_wal = profile_dir / "cookies.sqlite-wal"
+    cookies_db = _find_firefox_cookie_db(
+        profiles_dir, profile_name, cookie_file
+    )
+    cookies_wal = cookies_db.parent / "cookies.sqlite-wal"
 
     _copy_if_exists([cookies_db, cookies_wal], tmp_dir)
     db_file = tmp_dir / "cookies.sqlite"
     if not db_file.exists():
         raise FileNotFoundError(f"no Firefox cookies DB in temp dir {tmp_dir}")
-    with sqlite3.connect(db_file) as con:
-        con.execute("PRAGMA journal_mode=OFF;")  # merge WAL
+    # No need to merge the copied WAL file here: SQLite replays it when the
+    # copy is first opened, so the caller's connection sees its writes
     return db_file
 
 
@@ -218,13 +359,8 @@ def firefox_cookies(
     # Force a ValueError early if a string of an unrecognized browser is passed
     browser = BrowserType(browser)
 
-    if sys.platform.startswith("linux"):
-        os = "linux"
-    elif sys.platform == "darwin":
-        os = "macos"
-    elif sys.platform == "win32":
-        os = "windows"
-    else:
+    os = _PLATFORM_OS.get(sys.platform)
+    if os is None:
         raise OSError(
             "This script only works on "
             + ", ".join(FIREFOX_OS_PROFILE_DIRS.keys())
@@ -232,17 +368,37 @@ def firefox_cookies(
 
     profiles_dir = _get_profiles_dir_for_os(os, browser)
 
-    cookies: list[Cookie] = []
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        db_file = _load_firefox_cookie_db(
-            profiles_dir, Path(tmp_dir), profile_name, cookie_file
-        )
-        for host_key in generate_host_keys(domain):
-            with sqlite3.connect(db_file) as con:
-                con.row_factory = sqlite3.Row
-                res = con.execute(FIREFOX_COOKIE_SELECT_SQL, (host_key,))
-                for row in res.fetchall():
-                    cookies.append(Cookie(**row))
+    host_keys = generate_host_keys(domain)
+    want_cookies = bool(as_cookies or curl_cookie_file)
+    cookies_db = _find_firefox_cookie_db(
+        profiles_dir, profile_name, cookie_file
+    )
+
+    # If Firefox isn't running its cookie DB can be read in place, which saves
+    # copying it. `timeout=0` so that if Firefox holds its lock on the DB, this
+    # fails straight away (rather than after the default 5 seconds) and falls
+    # back to reading from a copy.
+    cookies_db = cookies_db.expanduser().absolute()
+    uri = f"{cookies_db.as_uri()}?mode=ro"
+    try:
+        with contextlib.closing(
+            sqlite3.connect(uri, uri=True, timeout=0)
+        ) as con:
+            result = _select_cookies(con, host_keys, want_cookies)
+    # `DatabaseError` rather than just `OperationalError` (locked), so that a
+    # read torn by Firefox writing to the DB also falls back to the copy
+    except sqlite3.DatabaseError:
+        logger.debug("Reading %s failed, reading from a copy", cookies_db)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_file = _load_firefox_cookie_db(
+                profiles_dir, Path(tmp_dir), cookie_file=cookies_db
+            )
+            with contextlib.closing(sqlite3.connect(db_file)) as con:
+                result = _select_cookies(con, host_keys, want_cookies)
+
+    if not want_cookies:
+        return result
+    cookies = t.cast(list[Cookie], result)
 
     if curl_cookie_file:
         write_cookie_file(curl_cookie_file, cookies)
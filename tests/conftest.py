@@ -0,0 +1,45 @@
+"""Fixtures shared by the pycookiecheat tests."""
+
+from __future__ import annotations
+
+import typing as t
+
+import pytest
+
+if t.TYPE_CHECKING:
+    from playwright.sync_api import Playwright
+
+# Fixtures which launch a real browser; tests using them are marked `slow`
+BROWSER_FIXTURES = frozenset({"pw"})
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Register the `slow` marker."""
+    config.addinivalue_line(
+        "markers", "slow: needs a real browser, launched with Playwright"
+    )
+
+
+def pytest_collection_modifyitems(items: t.List[pytest.Item]) -> None:
+    """Mark the tests that launch a browser, directly or not, as `slow`.
+
+    `fixturenames` includes the fixtures requested by other fixtures, so
+    anything built on `pw` is caught without having to be listed here.
+    """
+    slow = pytest.mark.slow
+    for item in items:
+        if BROWSER_FIXTURES.intersection(getattr(item, "fixturenames", ())):
+            item.add_marker(slow)
+
+
+@pytest.fixture(scope="session")
+def pw() -> t.Iterator[Playwright]:
+    """Start Playwright for the tests that need a real browser.
+
+    Each `sync_playwright()` starts a new Playwright driver process, so have
+    the browser fixtures share a single one for the whole session.
+    """
+    from playwright.sync_api import sync_playwright
+
+    with sync_playwright() as p:
+        yield p
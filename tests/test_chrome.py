@@ -1,5 +1,8 @@
 """test_pycookiecheat.py :: Tests for pycookiecheat module."""
 
+from __future__ import annotations
+
+import asyncio
 import os
 import sys
 import time
@@ -9,16 +12,33 @@ from tempfile import TemporaryDirectory
 from uuid import uuid4
 
 import pytest
-from playwright.sync_api import sync_playwright
+from cryptography.hazmat.primitives.ciphers import Cipher
+from cryptography.hazmat.primitives.ciphers.algorithms import AES
+from cryptography.hazmat.primitives.ciphers.modes import CBC
+
+from pycookiecheat import (
+    BrowserType,
+    ChromeCookieJar,
+    chrome_cookies,
+    chrome_cookies_async,
+    get_cookies,
+)
+from pycookiecheat.chrome import (
+    _decrypt_all,
+    chrome_decrypt,
+    clean,
+    get_linux_config,
+    get_macos_config,
+)
 
-from pycookiecheat import BrowserType, chrome_cookies, get_cookies
-from pycookiecheat.chrome import get_linux_config, get_macos_config
+if t.TYPE_CHECKING:
+    from playwright.sync_api import Playwright
 
 BROWSER = os.environ.get("TEST_BROWSER_NAME", "Chromium")
 
 
-@pytest.fixture(scope="module")
-def ci_setup() -> t.Generator:
+@pytest.fixture(scope="session")
+def ci_setup(pw: Playwright) -> t.Generator:
     """Set up Chrome's cookies file and directory.
 
     Unfortunately, at least on MacOS 11, I haven't found a way to do this using
@@ -41,9 +61,9 @@ def ci_setup() -> t.Generator:
 
     https://chromium.googlesource.com/chromium/src/+/refs/heads/master/components/os_crypt/keychain_password_mac.mm
     """
-    with TemporaryDirectory() as cookies_home, sync_playwright() as p:
+    with TemporaryDirectory() as cookies_home:
         ex_path = os.environ.get("TEST_BROWSER_PATH")
-        browser = p.chromium.launch_persistent_context(
+        browser = pw.chromium.launch_persistent_context(
             cookies_home,
             headless=False,
             chromium_sandbox=False,
@@ -109,6 +129,79 @@ def test_fake_cookie(ci_setup: str) -> None:
     )
 
 
+def test_fake_cookie_async(ci_setup: str) -> None:
+    """Ensure `chrome_cookies_async()` matches `chrome_cookies()`."""
+    cookies = asyncio.run(
+        chrome_cookies_async(
+            "https://n8henrie.com",
+            cookie_file=ci_setup,
+            browser=BrowserType(BROWSER),
+        )
+    )
+    assert cookies == chrome_cookies(
+        "https://n8henrie.com",
+        cookie_file=ci_setup,
+        browser=BrowserType(BROWSER),
+    )
+
+
+def test_cookie_jar(ci_setup: str) -> None:
+    """Ensure a `ChromeCookieJar` can be reused for several URLs."""
+    with ChromeCookieJar(BrowserType(BROWSER), cookie_file=ci_setup) as jar:
+        cookies = t.cast(dict, jar.get("https://n8henrie.com"))
+        assert cookies.get("test_pycookiecheat") == "It worked!"
+        assert jar.get("http://{0}.com".format(uuid4())) == dict()
+
+    assert cookies == chrome_cookies(
+        "https://n8henrie.com",
+        cookie_file=ci_setup,
+        browser=BrowserType(BROWSER),
+    )
+
+
+def test_clean(caplog: pytest.LogCaptureFixture) -> None:
+    """Padding is stripped, and out of range padding is rejected."""
+    assert clean(b"abc\x03\x03\x03") == "abc"
+    assert clean(b"a" + b"\x0f" * 15) == "a"
+    for bad in [b"abc\x00", b"abc\x11"]:
+        with pytest.raises(ValueError, match="Invalid padding length"):
+            clean(bad)
+    assert "invalid padding" in caplog.text
+    assert "UTF8" not in caplog.text
+
+    with pytest.raises(UnicodeDecodeError):
+        clean(b"\xff\x01")
+    assert "UTF8 decoding" in caplog.text
+
+
+@pytest.mark.parametrize("cookie_database_version", [0, 24])
+def test_decrypt_all(cookie_database_version: int) -> None:
+    """Batched decryption matches decrypting each cookie on its own."""
+    key = bytes(range(16))
+    init_vector = b" " * 16
+    cipher = Cipher(AES(key), CBC(init_vector))
+    values = ["a", "x" * 15, "y" * 16, "z" * 40, "ünïcode"]
+
+    encrypted_values = []
+    for value in values:
+        plaintext = value.encode("utf8")
+        if cookie_database_version >= 24:
+            plaintext = bytes(32) + plaintext
+        padding = 16 - len(plaintext) % 16
+        plaintext += bytes([padding]) * padding
+        encryptor = cipher.encryptor()
+        encrypted_values.append(
+            b"v10" + encryptor.update(plaintext) + encryptor.finalize()
+        )
+
+    decrypted = _decrypt_all(encrypted_values, cipher, cookie_database_version)
+    assert decrypted == values
+    assert decrypted == [
+        chrome_decrypt(ev, key, init_vector, cookie_database_version)
+        for ev in encrypted_values
+    ]
+
+
 def test_raises_on_wrong_browser() -> None:
     """Passing a browser other than Chrome or Chromium raises ValueError."""
     with pytest.raises(ValueError):
@@ -121,7 +214,7 @@ def test_raises_on_wrong_browser() -> None:
         )
 
 
-def test_slack_config() -> None:
+def test_slack_config(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
     """Tests configuring for cookies from the macos Slack app.
 
     Hard to come up with a mock test, since the only functionality provided by
@@ -130,11 +223,13 @@ def test_slack_config() -> None:
     """
     cfgs = []
     if sys.platform == "darwin":
+        # `get_macos_config` checks for the direct download's cookie file
+        # without expanding `~`, i.e. relative to the working directory, so
+        # create it in a temporary one rather than wherever the tests run
+        monkeypatch.chdir(tmp_path)
         cfgs.append(get_macos_config(BrowserType.SLACK))
 
-        parent = Path(
-            "~/Library/Application Support/BraveSoftware/Brave-Browser/Default"
-        )
+        parent = Path("~/Library/Application Support/Slack")
         parent.mkdir(parents=True)
         (parent / "Cookies").touch()
         cfgs.append(get_macos_config(BrowserType.SLACK))
@@ -147,6 +242,27 @@ def test_slack_config() -> None:
         assert "Slack" in str(cfg["cookie_file"])
 
 
+def test_linux_key_material_not_cached_on_failure(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Ensure a failed keyring lookup is retried, and a successful one isn't.
+
+    E.g. the keyring may still be locked the first time round.
+    """
+    import keyring
+
+    passwords = [None, "from keyring"]
+    monkeypatch.setattr("pycookiecheat.chrome._import_secret", lambda: None)
+    monkeypatch.setattr("pycookiecheat.chrome._linux_key_materials", {})
+    # Raises `IndexError` if called more than twice
+    monkeypatch.setattr(keyring, "get_password", lambda *_: passwords.pop(0))
+
+    assert get_linux_config(BrowserType.CHROME)["key_material"] == "peanuts"
+    for _ in range(2):
+        config = get_linux_config(BrowserType.CHROME)
+        assert config["key_material"] == "from keyring"
+
+
 def test_macos_bad_browser_variant() -> None:
     """Tests the error message resulting from unrecognized BrowserType."""
     for invalid in [BrowserType.FIREFOX, "foo"]:
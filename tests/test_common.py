@@ -9,6 +9,7 @@ from pycookiecheat.common import (
     BrowserType,
     Cookie,
     generate_host_keys,
+    get_domain,
 )
 
 
@@ -54,6 +55,25 @@ def test_generate_host_keys(host: str, host_keys: t.Iterable[str]) -> None:
     assert list(generate_host_keys(host)) == host_keys
 
 
+@pytest.mark.parametrize(
+    "url,domain",
+    [
+        ("https://n8henrie.com", "n8henrie.com"),
+        ("http://foo.bar.example.org/path?q=1", "foo.bar.example.org"),
+        ("n8henrie.com", "n8henrie.com"),
+        ("github.com/n8henrie?next=https://x.org", "github.com"),
+        ("localhost:8000/", "localhost:8000"),
+        ("https://example.com\n", "example.com"),
+        (" https://example.com", "example.com"),
+        ("\thttps://ex.com", "ex.com"),
+        ("https://exam\tple.com/", "example.com"),
+    ],
+)
+def test_get_domain(url: str, domain: str) -> None:
+    """Test `get_domain()`, including URLs missing a scheme."""
+    assert get_domain(url) == domain
+
+
 def test_cli() -> None:
     """Test the cli.
     When cli tests fail, it probably means that examples in the readme need to
@@ -69,3 +89,17 @@ def test_cli() -> None:
 
     args = _cli().parse_args(["n8henrie.com", "--browser", "firefox"])
     assert args.browser == BrowserType.FIREFOX
+
+    args = _cli().parse_args(["n8henrie.com", "github.com", "example.com"])
+    assert args.url == "n8henrie.com"
+    assert args.more_urls == ["github.com", "example.com"]
+
+
+def test_cli_version(capsys: pytest.CaptureFixture) -> None:
+    """Test that `--version` prints the installed version and exits."""
+    from importlib.metadata import version
+
+    with pytest.raises(SystemExit) as exc:
+        _cli().parse_args(["--version"])
+    assert exc.value.code == 0
+    assert capsys.readouterr().out.strip() == version("pycookiecheat")
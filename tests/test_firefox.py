@@ -1,135 +1,176 @@
 """Tests for Firefox cookies & helper functions."""
 
+from __future__ import annotations
+
+import contextlib
 import re
+import sqlite3
+import time
 import typing as t
-from datetime import datetime, timedelta
-from http.cookies import SimpleCookie
+from datetime import datetime, timedelta, timezone
 from http.server import BaseHTTPRequestHandler, HTTPServer
 from pathlib import Path
-from textwrap import dedent
 from threading import Thread
 from unittest.mock import patch
 
 import pytest
-from playwright.sync_api import sync_playwright
 from pytest import FixtureRequest, TempPathFactory
 
 from pycookiecheat import BrowserType, firefox_cookies, get_cookies
 from pycookiecheat.firefox import (
+    _PLATFORM_OS,
     FirefoxProfileNotPopulatedError,
     _find_firefox_default_profile,
     _get_profiles_dir_for_os,
     _load_firefox_cookie_db,
+    _read_profiles_ini,
 )
 
+if t.TYPE_CHECKING:
+    from playwright.sync_api import Playwright
+
 TEST_PROFILE_NAME = "test-profile"
 TEST_PROFILE_DIR = f"1234abcd.{TEST_PROFILE_NAME}"
 
-PROFILES_INI_VERSION1 = dedent(
-    f"""
-    [General]
-    StartWithLastProfile=1
-
-    [Profile0]
-    Name={TEST_PROFILE_NAME}
-    IsRelative=1
-    Path={TEST_PROFILE_DIR}
-    Default=1
-
-    [Profile1]
-    Name={TEST_PROFILE_NAME}2
-    IsRelative=1
-    Path=abcdef01.{TEST_PROFILE_NAME}2
-    """
-)
-
-PROFILES_INI_VERSION2 = dedent(
-    f"""
-    [Install8149948BEF895A0D]
-    Default={TEST_PROFILE_DIR}
-    Locked=1
-
-    [General]
-    StartWithLastProfile=1
-    Version=2
-
-    [Profile0]
-    Name={TEST_PROFILE_NAME}
-    IsRelative=1
-    Path={TEST_PROFILE_DIR}
-    Default=1
-    """
-)
-
-PROFILES_INI_EMPTY = dedent(
-    """
-    [General]
-    StartWithLastProfile=1
-    Version=2
-    """
+# The curl cookie file expected for the cookie set by `set_cookie`
+CURL_COOKIE_FILE_RE = re.compile(
+    r"# Netscape HTTP Cookie File\n"
+    r"localhost\tTRUE\t/\tFALSE\t[0-9]+\tfoo\tbar\n"
 )
 
-PROFILES_INI_VERSION1_NO_DEFAULT = dedent(
-    f"""
-    [General]
-    StartWithLastProfile=1
-    Version=2
-
-    [Profile0]
-    Name={TEST_PROFILE_NAME}
-    IsRelative=1
-    Path={TEST_PROFILE_DIR}
-    """
+# When the cookie set by `cookie_server` expires; any time in the future will
+# do, so work it out once rather than on every request
+COOKIE_EXPIRES = (datetime.now(timezone.utc) + timedelta(days=1)).strftime(
+    "%a, %d %b %Y %H:%M:%S GMT"
 )
 
-PROFILES_INI_VERSION2_NO_DEFAULT = dedent(
-    f"""
-    [Install8149948BEF895A0D]
-    Default={TEST_PROFILE_DIR}
-    Locked=1
-
-    [General]
-    StartWithLastProfile=1
-    Version=2
-
-    [Profile0]
-    Name={TEST_PROFILE_NAME}
-    IsRelative=1
-    Path={TEST_PROFILE_DIR}
-    """
-)
+PROFILES_INI_VERSION1 = f"""
+[General]
+StartWithLastProfile=1
+
+[Profile0]
+Name={TEST_PROFILE_NAME}
+IsRelative=1
+Path={TEST_PROFILE_DIR}
+Default=1
+
+[Profile1]
+Name={TEST_PROFILE_NAME}2
+IsRelative=1
+Path=abcdef01.{TEST_PROFILE_NAME}2
+"""
+
+PROFILES_INI_VERSION2 = f"""
+[Install8149948BEF895A0D]
+Default={TEST_PROFILE_DIR}
+Locked=1
+
+[General]
+StartWithLastProfile=1
+Version=2
+
+[Profile0]
+Name={TEST_PROFILE_NAME}
+IsRelative=1
+Path={TEST_PROFILE_DIR}
+Default=1
+"""
+
+PROFILES_INI_EMPTY = """
+[General]
+StartWithLastProfile=1
+Version=2
+"""
+
+PROFILES_INI_VERSION1_NO_DEFAULT = f"""
+[General]
+StartWithLastProfile=1
+Version=2
+
+[Profile0]
+Name={TEST_PROFILE_NAME}
+IsRelative=1
+Path={TEST_PROFILE_DIR}
+"""
+
+PROFILES_INI_VERSION2_NO_DEFAULT = f"""
+[Install8149948BEF895A0D]
+Default={TEST_PROFILE_DIR}
+Locked=1
+
+[General]
+StartWithLastProfile=1
+Version=2
+
+[Profile0]
+Name={TEST_PROFILE_NAME}
+IsRelative=1
+Path={TEST_PROFILE_DIR}
+"""
+
+
+# An empty Firefox cookie DB, in the format of `sqlite3 cookies.sqlite .dump`
+FIREFOX_COOKIES_SQL = Path(__file__).parent / "data" / "firefox_cookies.sql"
 
 
 def _make_test_profiles(
-    tmp_path: Path, profiles_ini_content: str, populate: bool = True
-) -> t.Iterator[Path]:
+    tmp_path: Path,
+    profiles_ini_content: str,
+    cookie_db: t.Optional[sqlite3.Connection] = None,
+) -> Path:
     """Create a Firefox data dir with profile & (optionally) populate it.
 
     All of the fixtures using this function use the pytest builtin `tmp_path`
     or `tmp_path_factory` fixtures to create their temporary directories.
+
+    The profile is populated with a copy of `cookie_db`, if given.
     """
     profile_dir = tmp_path / TEST_PROFILE_DIR
     profile_dir.mkdir()
     (tmp_path / "profiles.ini").write_text(profiles_ini_content)
-    if populate:
-        with sync_playwright() as p:
-            p.firefox.launch_persistent_context(
-                user_data_dir=profile_dir,
-                headless=True,
-            ).close()
-    with patch(
+    if cookie_db is not None:
+        with contextlib.closing(
+            sqlite3.connect(profile_dir / "cookies.sqlite")
+        ) as con:
+            cookie_db.backup(con)
+    return tmp_path
+
+
+def _patch_profiles_dir(profiles_dir: Path) -> t.ContextManager[t.Any]:
+    """Use `profiles_dir` as the Firefox data dir, e.g. for `firefox_cookies`.
+
+    This is kept apart from creating the data dir so that the patch can be
+    scoped more narrowly than the (expensive to create) files.
+    """
+    return patch(
         "pycookiecheat.firefox._get_profiles_dir_for_os",
-        return_value=tmp_path,
-    ):
-        yield tmp_path
+        return_value=profiles_dir,
+    )
+
+
+@pytest.fixture(scope="session")
+def cookie_db_template() -> t.Iterator[sqlite3.Connection]:
+    """Create an empty Firefox cookie DB in memory, to copy into profiles.
+
+    This is all launching Firefox with a new profile does as far as the
+    cookie DB is concerned, at a fraction of the cost. Copying it with
+    `backup` is cheaper still than creating the schema for every profile.
+    """
+    with contextlib.closing(sqlite3.connect(":memory:")) as con:
+        con.executescript(FIREFOX_COOKIES_SQL.read_text())
+        yield con
 
 
 @pytest.fixture(scope="module")
-def profiles(tmp_path_factory: TempPathFactory) -> t.Iterator[Path]:
+def profiles(
+    tmp_path_factory: TempPathFactory, cookie_db_template: sqlite3.Connection
+) -> t.Iterator[Path]:
     """Create a Firefox data dir with profiles & cookie DBs."""
-    yield from _make_test_profiles(
-        tmp_path_factory.mktemp("_"), PROFILES_INI_VERSION2
+    profiles_dir = _make_test_profiles(
+        tmp_path_factory.mktemp("_"), PROFILES_INI_VERSION2, cookie_db_template
     )
+    with _patch_profiles_dir(profiles_dir):
+        yield profiles_dir
 
 
 @pytest.fixture(
@@ -143,32 +184,42 @@ def profiles(tmp_path_factory: TempPathFactory) -> t.Iterator[Path]:
 )
 def profiles_ini_versions(
     tmp_path_factory: TempPathFactory, request: FixtureRequest
-) -> t.Iterator[Path]:
+) -> Path:
     """Create a Firefox data dir using varius `profiles.ini` types.
 
     Use different file format versions and contents.
+
+    Only profile discovery is tested with these, so the cookie DB merely has
+    to exist: an empty file (which SQLite reads as an empty DB) will do.
     """
-    yield from _make_test_profiles(tmp_path_factory.mktemp("_"), request.param)
+    profiles_dir = _make_test_profiles(
+        tmp_path_factory.mktemp("_"), request.param
+    )
+    (profiles_dir / TEST_PROFILE_DIR / "cookies.sqlite").touch()
+    return profiles_dir
 
 
 @pytest.fixture(scope="module")
-def no_profiles(tmp_path_factory: TempPathFactory) -> t.Iterator[Path]:
+def no_profiles(tmp_path_factory: TempPathFactory) -> Path:
     """Create a Firefox data dir with a `profiles.ini` with no profiles."""
-    yield from _make_test_profiles(
+    return _make_test_profiles(
         tmp_path_factory.mktemp("_"), PROFILES_INI_EMPTY
     )
 
 
-# TODO: Making this fixture module-scoped breaks the tests using the `profiles`
-#       fixture. Find out why.
-@pytest.fixture
-def profiles_unpopulated(tmp_path: Path) -> t.Iterator[Path]:
+@pytest.fixture(scope="module")
+def profiles_unpopulated(tmp_path_factory: TempPathFactory) -> Path:
     """Create a Firefox data dir with valid but upopulated `profiles.ini` file.
 
     "Unpopulated" means never actually used to launch Firefox with.
+
+    Unlike the other data dirs this one isn't patched in as the default: a
+    module-scoped patch stays in place for the rest of the module, so it would
+    be picked up by the tests using `profiles`. Its tests pass the directory
+    explicitly instead.
     """
-    yield from _make_test_profiles(
-        tmp_path, PROFILES_INI_VERSION2, populate=False
+    return _make_test_profiles(
+        tmp_path_factory.mktemp("_"), PROFILES_INI_VERSION2
     )
 
 
@@ -182,22 +233,16 @@ def cookie_server() -> t.Iterator[int]:
     Returns:
         The port of the server on localhost.
     """
+    # Needs an expiry time, otherwise it's a session cookie, which are never
+    # saved to disk. (Well, _technically_ they sometimes are, when the browser
+    # is set to resume the session on restart, but we aren't concerned with
+    # that here.)
+    set_cookie_header = f"foo=bar; Path=/; Expires={COOKIE_EXPIRES}"
 
     class CookieSetter(BaseHTTPRequestHandler):
         def do_GET(self) -> None:  # noqa: N802, must be named with HTTP verb
             self.send_response(200)
-            cookie: SimpleCookie = SimpleCookie()
-            cookie["foo"] = "bar"
-            cookie["foo"]["path"] = "/"
-            # Needs an expiry time, otherwise it's a session cookie, which are
-            # never saved to disk. (Well, _technically_ they sometimes are,
-            # when the browser is set to resume the session on restart, but we
-            # aren't concerned with that here.)
-            this_time_tomorrow = datetime.utcnow() + timedelta(days=1)
-            cookie["foo"]["expires"] = this_time_tomorrow.strftime(
-                "%a, %d %b %Y %H:%M:%S GMT"
-            )
-            self.send_header("Set-Cookie", cookie["foo"].OutputString())
+            self.send_header("Set-Cookie", set_cookie_header)
             self.end_headers()
 
         def log_message(self, *_: t.Any) -> None:
@@ -210,15 +255,76 @@ def cookie_server() -> t.Iterator[int]:
 
 
 @pytest.fixture
-def set_cookie(profiles: Path, cookie_server: int) -> t.Iterator[None]:
+def set_cookie(profiles: Path) -> t.Iterator[None]:
+    """Save a "foo: bar" cookie for localhost to the profile's cookie DB.
+
+    The row is written straight to the DB, the way Firefox would store it,
+    and deleted again afterwards.
+    """
+    cookie_db = profiles / TEST_PROFILE_DIR / "cookies.sqlite"
+    # Needs an expiry time, otherwise it's a session cookie (see
+    # `cookie_server`)
+    this_time_tomorrow = int(time.time()) + 24 * 60 * 60
+    with contextlib.closing(sqlite3.connect(cookie_db)) as con, con:
+        con.execute(
+            "INSERT INTO moz_cookies "
+            "(name, value, host, path, expiry, isSecure, isHttpOnly) "
+            "VALUES ('foo', 'bar', 'localhost', '/', ?, 0, 0)",
+            (this_time_tomorrow,),
+        )
+    yield
+    with contextlib.closing(sqlite3.connect(cookie_db)) as con, con:
+        con.execute("DELETE FROM moz_cookies")
+
+
+@pytest.fixture
+def set_cookie_locked(
+    tmp_path: Path, cookie_db_template: sqlite3.Connection
+) -> t.Iterator[None]:
+    """Save a "foo: bar" cookie to a DB locked the way a running Firefox does.
+
+    Firefox keeps its cookie DB in WAL mode with an exclusive lock, so other
+    processes can't read it in place. The cookie is left in the WAL (not
+    checkpointed into the DB file), so it is only found if the WAL is read
+    too.
+    """
+    profiles_dir = _make_test_profiles(
+        tmp_path, PROFILES_INI_VERSION2, cookie_db_template
+    )
+    cookie_db = profiles_dir / TEST_PROFILE_DIR / "cookies.sqlite"
+    this_time_tomorrow = int(time.time()) + 24 * 60 * 60
+    with contextlib.closing(sqlite3.connect(cookie_db)) as con:
+        con.execute("PRAGMA journal_mode = WAL")
+        con.execute("PRAGMA wal_autocheckpoint = 0")
+        con.execute("PRAGMA locking_mode = EXCLUSIVE")
+        # The lock is taken by the first write, and kept until `con` closes
+        with con:
+            con.execute(
+                "INSERT INTO moz_cookies "
+                "(name, value, host, path, expiry, isSecure, isHttpOnly) "
+                "VALUES ('foo', 'bar', 'localhost', '/', ?, 0, 0)",
+                (this_time_tomorrow,),
+            )
+        with _patch_profiles_dir(profiles_dir):
+            yield
+
+
+@pytest.fixture
+def set_cookie_with_browser(
+    pw: Playwright, tmp_path: Path, cookie_server: int
+) -> t.Iterator[None]:
     """Launch Firefox and visit the cookie-setting server.
 
     The cookie is set, saved to the DB and the browser closes. Ideally the
     browser should still be running while the cookie tests run, but the
     synchronous playwright API doesn't support that.
+
+    Firefox creates the cookie DB in the (so far empty) profile itself, so
+    this checks reading a DB exactly as Firefox writes it.
     """
-    profile_dir = profiles / TEST_PROFILE_DIR
-    with sync_playwright() as p, p.firefox.launch_persistent_context(
+    profiles_dir = _make_test_profiles(tmp_path, PROFILES_INI_VERSION2)
+    profile_dir = profiles_dir / TEST_PROFILE_DIR
+    with pw.firefox.launch_persistent_context(
         user_data_dir=profile_dir
     ) as context:
         context.new_page().goto(
@@ -232,25 +338,31 @@ def set_cookie(profiles: Path, cookie_server: int) -> t.Iterator[None]:
     # support it. This means the tests don't test getting cookies while
     # Firefox is running.
     # TODO: Try using the async playwright API instead.
-    yield
+    with _patch_profiles_dir(profiles_dir):
+        yield
 
 
 @pytest.mark.parametrize(
-    "os_name,expected_dir",
+    "platform,os_name,expected_dir",
     [
-        ("linux", "~/.mozilla/firefox"),
-        ("macos", "~/Library/Application Support/Firefox"),
-        ("windows", "~/AppData/Roaming/Mozilla/Firefox/Profiles"),
+        ("linux", "linux", "~/.mozilla/firefox"),
+        ("darwin", "macos", "~/Library/Application Support/Firefox"),
+        (
+            "win32",
+            "windows",
+            "~/AppData/Roaming/Mozilla/Firefox/Profiles",
+        ),
     ],
 )
 def test_get_profiles_dir_for_os_valid(
-    os_name: str, expected_dir: str
+    platform: str, os_name: str, expected_dir: str
 ) -> None:
-    """Test profile paths for each OS.
+    """Test profile paths for each OS, and the OS for each `sys.platform`.
 
     Test only implicit "Firefox" default, since it's the only type we currently
     support.
     """
+    assert _PLATFORM_OS[platform] == os_name
     profiles_dir = _get_profiles_dir_for_os(os_name, BrowserType.FIREFOX)
     assert profiles_dir == Path(expected_dir).expanduser()
 
@@ -276,6 +388,26 @@ def test_firefox_get_default_profile_valid(
     assert (profile_dir / "cookies.sqlite").is_file()
 
 
+def test_read_profiles_ini(tmp_path: Path) -> None:
+    """Test reading `profiles.ini`, including comments and a missing file."""
+    profiles_ini = tmp_path / "profiles.ini"
+    assert _read_profiles_ini(profiles_ini) == {}
+
+    profiles_ini.write_text(
+        "; a comment\n" + PROFILES_INI_VERSION2 + "[Profile1]\nPath = a=b\n"
+    )
+    sections = _read_profiles_ini(profiles_ini)
+    assert list(sections) == [
+        "Install8149948BEF895A0D",
+        "General",
+        "Profile0",
+        "Profile1",
+    ]
+    assert sections["Install8149948BEF895A0D"]["default"] == TEST_PROFILE_DIR
+    assert sections["Profile0"]["default"] == "1"
+    assert sections["Profile1"]["path"] == "a=b"
+
+
 def test_firefox_get_default_profile_invalid(no_profiles: Path) -> None:
     """Ensure profile discovery in an invalid data dir raises an exception."""
     with pytest.raises(Exception, match="no profiles found"):
@@ -310,8 +442,10 @@ def test_load_firefox_cookie_db_copy_error(
     tmp_path: Path, profiles: Path
 ) -> None:
     """Test loading Firefox cookies DB when copying fails."""
-    # deliberately break copy function
-    with patch("shutil.copy2"), pytest.raises(
+    # deliberately break copy function, as if the files vanished mid-copy
+    with patch(
+        "shutil.copyfile", side_effect=FileNotFoundError
+    ), pytest.raises(
         FileNotFoundError, match="no Firefox cookies DB in temp dir"
     ):
         _load_firefox_cookie_db(
@@ -321,11 +455,14 @@ def test_load_firefox_cookie_db_copy_error(
         )
 
 
-def test_firefox_cookies(set_cookie: None) -> None:
+@pytest.mark.parametrize(
+    "profile_name", [TEST_PROFILE_DIR, f"*.{TEST_PROFILE_NAME}"]
+)
+def test_firefox_cookies(set_cookie: None, profile_name: str) -> None:
     """Test getting Firefox cookies after visiting a site with cookies."""
     cookies = t.cast(
         dict,
-        firefox_cookies("http://localhost", profile_name=TEST_PROFILE_DIR),
+        firefox_cookies("http://localhost", profile_name=profile_name),
     )
     assert len(cookies) > 0
     assert cookies["foo"] == "bar"
@@ -333,10 +470,38 @@ def test_firefox_cookies(set_cookie: None) -> None:
     assert cookies == get_cookies(
         "http://localhost",
         browser=BrowserType.FIREFOX,
-        profile_name=TEST_PROFILE_DIR,
+        profile_name=profile_name,
     )
 
 
+def test_firefox_cookies_cookie_file(profiles: Path, set_cookie: None) -> None:
+    """Test getting Firefox cookies from an explicitly given cookie file."""
+    # No such profile, so this only works if `cookie_file` is used instead
+    cookies = firefox_cookies(
+        "http://localhost",
+        cookie_file=profiles / TEST_PROFILE_DIR / "cookies.sqlite",
+        profile_name="does-not-exist",
+    )
+    assert cookies == {"foo": "bar"}
+
+
+def test_firefox_cookies_locked(set_cookie_locked: None) -> None:
+    """Test getting Firefox cookies while Firefox has the DB locked."""
+    cookies = firefox_cookies(
+        "http://localhost", profile_name=TEST_PROFILE_DIR
+    )
+    assert cookies == {"foo": "bar"}
+
+
+def test_firefox_cookies_set_by_browser(set_cookie_with_browser: None) -> None:
+    """Test getting cookies Firefox saved itself after visiting a site."""
+    cookies = t.cast(
+        dict,
+        firefox_cookies("http://localhost", profile_name=TEST_PROFILE_DIR),
+    )
+    assert cookies["foo"] == "bar"
+
+
 def test_firefox_no_cookies(profiles: Path) -> None:
     """Ensure Firefox cookies for an unvisited site are empty."""
     cookies = firefox_cookies(
@@ -356,26 +521,10 @@ def test_firefox_cookies_curl_cookie_file(
         curl_cookie_file=str(cookie_file),
     )
     assert cookie_file.exists()
-    assert re.fullmatch(
-        (
-            r"# Netscape HTTP Cookie File\nlocalhost\tTRUE\t/\tFALSE\t[0-9]+"
-            r"\tfoo\tbar\n"
-        ),
-        cookie_file.read_text(),
-    )
-
-
-@pytest.mark.parametrize("fake_os", ["linux", "darwin", "win32"])
-def test_firefox_cookies_os(fake_os: str, profiles: Path) -> None:
-    """Ensure the few lines of OS switching code are covered by a test."""
-    with patch("sys.platform", fake_os):
-        cookies = firefox_cookies(
-            "http://example.org", profile_name=TEST_PROFILE_DIR
-        )
-        assert isinstance(cookies, dict)
+    assert CURL_COOKIE_FILE_RE.fullmatch(cookie_file.read_text())
 
 
-def test_firefox_cookies_os_invalid(profiles: Path) -> None:
+def test_firefox_cookies_os_invalid() -> None:
     """Ensure an invalid OS raises an exception."""
     with patch("sys.platform", "invalid"):
         with pytest.raises(OSError):